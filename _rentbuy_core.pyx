@@ -0,0 +1,87 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+Optional Cython build of the rent-vs-buy month loop, for users who cannot
+install numba. Mirrors _simulate_loop in main-new.py exactly; keep the two
+in sync. Build with `python setup.py build_ext --inplace` (needs Cython).
+"""
+
+
+cpdef tuple simulate_core(
+    int months, int n_m, double house_price, double monthly_rent,
+    double down_payment, double loan_principal, double r_m,
+    double mort_payment, double f_house, double f_rent, double f_inv,
+    double gov_rate_pct_of_rent_annual, double mgmt_step_rate,
+    double buy_closing_cost, bint invest_monthly_diffs,
+):
+    cdef double property_value = house_price
+    cdef double market_rent = monthly_rent
+    cdef double remaining_balance
+
+    cdef double owner_side_invest = 0.0
+    cdef double renter_invest = down_payment + buy_closing_cost
+
+    cdef double total_owner_cash_out = down_payment + buy_closing_cost
+    cdef double total_renter_cash_out = 0.0
+
+    cdef double one_plus_finv = 1.0 + f_inv
+
+    cdef double mgmt_fee, gov_rates, owner_monthly_cost, renter_monthly_cost
+    cdef double diff, cb
+    cdef int m
+    cdef int pay_months = min(months, n_m)
+
+    # Phase 1: amortizing (the balance is evaluated analytically afterwards)
+    for m in range(pay_months):
+        mgmt_fee = property_value * mgmt_step_rate
+        gov_rates = market_rent * gov_rate_pct_of_rent_annual
+
+        owner_monthly_cost = mort_payment + mgmt_fee + gov_rates
+        renter_monthly_cost = market_rent
+
+        owner_side_invest *= one_plus_finv
+        renter_invest *= one_plus_finv
+
+        if invest_monthly_diffs:
+            diff = owner_monthly_cost - renter_monthly_cost
+            renter_invest += max(diff, 0.0)
+            owner_side_invest += max(-diff, 0.0)
+
+        total_renter_cash_out += renter_monthly_cost
+        total_owner_cash_out += owner_monthly_cost
+
+        property_value *= f_house
+        market_rent *= f_rent
+
+    if r_m > 0.0:
+        cb = (1.0 + r_m) ** pay_months
+        remaining_balance = loan_principal * cb - mort_payment * (cb - 1.0) / r_m
+    else:
+        remaining_balance = loan_principal - mort_payment * pay_months
+    remaining_balance = max(remaining_balance, 0.0)
+
+    # Phase 2: loan paid off; the owner's only costs are mgmt fee and rates
+    for m in range(pay_months, months):
+        mgmt_fee = property_value * mgmt_step_rate
+        gov_rates = market_rent * gov_rate_pct_of_rent_annual
+
+        owner_monthly_cost = mgmt_fee + gov_rates
+        renter_monthly_cost = market_rent
+
+        owner_side_invest *= one_plus_finv
+        renter_invest *= one_plus_finv
+
+        if invest_monthly_diffs:
+            diff = owner_monthly_cost - renter_monthly_cost
+            renter_invest += max(diff, 0.0)
+            owner_side_invest += max(-diff, 0.0)
+
+        total_renter_cash_out += renter_monthly_cost
+        total_owner_cash_out += owner_monthly_cost
+
+        property_value *= f_house
+        market_rent *= f_rent
+
+    return (
+        remaining_balance, property_value, market_rent, owner_side_invest,
+        renter_invest, total_owner_cash_out, total_renter_cash_out,
+    )
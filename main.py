@@ -1,5 +1,3 @@
-import math
-
 house_price = 10000000
 monthly_rent = 30000
 price_to_rent_ratio = house_price / (monthly_rent * 12)
@@ -10,11 +8,18 @@ mortgage_rate = 0.035
 house_appreciation = 0.02
 investment_yield = 0.07
 
-monthly_payment = house_price * mortgage_rate / 12 * math.pow(1 + mortgage_rate / 12, years * 12)/(math.pow(1 + mortgage_rate / 12, years * 12) - 1)
+r_m = mortgage_rate / 12
+n = years * 12
+c_m = (1 + r_m) ** n
+monthly_payment = house_price * r_m * c_m / (c_m - 1)
 
 investment_amount = monthly_payment + house_price * 0.003 / 12 - monthly_rent
 
-investment_pv = investment_amount * (math.pow(1 + investment_yield / 12, 12 * years) - 1)/(investment_yield / 12)
+i_m = investment_yield / 12
+c_inv = (1 + i_m) ** n
+investment_pv = investment_amount * (c_inv - 1) / i_m
+
+house_fv = house_price * (1 + house_appreciation) ** years
 
-print(f"investment: {investment_pv} vs house: {house_price * math.pow(1 + house_appreciation, years)}")
-print(f"investment is ahead by {investment_pv - house_price * math.pow(1 + house_appreciation, years)}")
+print(f"investment: {investment_pv} vs house: {house_fv}")
+print(f"investment is ahead by {investment_pv - house_fv}")
@@ -0,0 +1,17 @@
+from setuptools import Extension, setup
+
+# The Cython core is optional: without Cython (or a C compiler) the
+# simulator falls back to numba or the interpreted loop.
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(
+        [Extension("_rentbuy_core", ["_rentbuy_core.pyx"])],
+        language_level=3,
+    )
+except ImportError:
+    ext_modules = []
+
+setup(
+    name="rent-vs-buy-hk",
+    ext_modules=ext_modules,
+)